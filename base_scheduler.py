@@ -0,0 +1,98 @@
+"""
+Struktur data dan kelas dasar bersama untuk semua algoritma scheduling
+(HEFT, FCFS, RR)
+"""
+
+from typing import List, Dict, NamedTuple
+from dataclasses import dataclass
+
+
+@dataclass
+class Task:
+    """Representasi task dalam DAG"""
+    __slots__ = ('id', 'computation_cost', 'predecessors', 'successors')
+    
+    id: int
+    computation_cost: Dict[int, float]  # {processor_id: execution_time}
+    predecessors: List[int]  # List of task IDs yang harus selesai sebelum task ini
+    successors: List[int]  # List of task IDs yang bergantung pada task ini
+
+
+class ScheduleEvent(NamedTuple):
+    """Representasi event scheduling (immutable)"""
+    task_id: int
+    processor_id: int
+    start_time: float
+    finish_time: float
+
+
+class BaseScheduler:
+    """
+    Kelas dasar scheduler: menyimpan schedule, availability processor
+    (diindeks berdasarkan posisi) dan makespan yang di-update secara incremental.
+    """
+    
+    def __init__(self, processors: List[int]):
+        """
+        Inisialisasi state scheduler
+        
+        Args:
+            processors: List of processor IDs
+        """
+        self.processors = processors
+        self.schedule: Dict[int, ScheduleEvent] = {}  # task_id -> ScheduleEvent
+        self._proc_index = {p: i for i, p in enumerate(processors)}
+        # List biasa (bukan array NumPy): diakses per elemen dari Python di loop scheduling
+        self._avail = [0.0] * len(processors)
+        self._makespan = 0.0
+    
+    @property
+    def processor_availability(self) -> Dict[int, float]:
+        """Waktu processor tersedia, dalam bentuk {processor_id: time}"""
+        return {p: self._avail[i] for p, i in self._proc_index.items()}
+    
+    @staticmethod
+    def _average_costs(tasks: List[Task]) -> Dict[int, float]:
+        """
+        Menghitung fallback execution time (rata-rata cost) sekali per task
+        
+        Args:
+            tasks: List of Task objects
+            
+        Returns:
+            Dictionary mapping task_id -> average computation cost
+        """
+        return {
+            t.id: (sum(t.computation_cost.values()) / len(t.computation_cost)) if t.computation_cost else 0.0
+            for t in tasks
+        }
+    
+    def _assign(self, task_id: int, pidx: int, exec_time: float, start_time: float) -> ScheduleEvent:
+        """
+        Menjadwalkan task ke processor dan meng-update availability serta makespan
+        
+        Args:
+            task_id: ID task
+            pidx: Indeks (posisi) processor
+            exec_time: Execution time task pada processor tersebut
+            start_time: Waktu mulai task
+        
+        Returns:
+            ScheduleEvent yang dibuat
+        """
+        finish_time = start_time + exec_time
+        event = ScheduleEvent(
+            task_id=task_id,
+            processor_id=self.processors[pidx],
+            start_time=start_time,
+            finish_time=finish_time
+        )
+        self.schedule[task_id] = event
+        self._avail[pidx] = finish_time
+        if finish_time > self._makespan:
+            self._makespan = finish_time
+        return event
+    
+    def get_makespan(self) -> float:
+        """Menghitung makespan (total waktu penyelesaian)"""
+        return self._makespan
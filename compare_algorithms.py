@@ -5,9 +5,12 @@ Script untuk membandingkan performa berbagai algoritma scheduling
 
 import subprocess
 import sys
+import csv
 import pandas as pd
 import os
 import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import matplotlib
 try:
@@ -23,9 +26,12 @@ SUMMARY_FILE = 'comparison_summary.csv'
 
 def run_algorithm(algo):
     """Menjalankan scheduler.py dengan algoritma tertentu."""
-    print(f"\n{'='*50}")
-    print(f"Running Algorithm: {algo.upper()}")
-    print(f"{'='*50}")
+    # Output dikumpulkan lalu dicetak sekaligus agar tidak bercampur saat dijalankan paralel
+    lines = [
+        f"\n{'='*50}",
+        f"Running Algorithm: {algo.upper()}",
+        f"{'='*50}",
+    ]
     
     cmd = [sys.executable, 'scheduler.py', '--algo', algo]
     
@@ -34,13 +40,15 @@ def run_algorithm(algo):
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         end_time = time.time()
         
-        print(result.stdout)
-        print(f"Execution finished in {end_time - start_time:.2f} seconds.")
+        lines.append(result.stdout)
+        lines.append(f"Execution finished in {end_time - start_time:.2f} seconds.")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"Error running {algo}:")
-        print(e.stderr)
+        lines.append(f"Error running {algo}:")
+        lines.append(e.stderr)
         return False
+    finally:
+        print("\n".join(lines))
 
 def collect_metrics():
     """Mengumpulkan metrik dari file CSV hasil."""
@@ -53,22 +61,36 @@ def collect_metrics():
             continue
             
         try:
-            df = pd.read_csv(filename)
+            # Agregasi satu kali jalan (streaming): memori O(jumlah VM), bukan O(jumlah baris)
+            # Asumsi start_time dan finish_time di CSV sudah dalam seconds relative
+            makespan = float('-inf')
+            total_wait_time = 0.0
+            total_exec_time = 0.0
+            count = 0
+            vm_loads = {}
+            
+            with open(filename, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    finish_time = float(row['finish_time'])
+                    exec_time = float(row['exec_time'])
+                    if finish_time > makespan:
+                        makespan = finish_time
+                    total_wait_time += float(row['wait_time'])
+                    total_exec_time += exec_time
+                    count += 1
+                    vm = row['vm_assigned']
+                    vm_loads[vm] = vm_loads.get(vm, 0.0) + exec_time
             
             # Hitung metrik ulang atau ambil dari log (di sini kita hitung ulang dari CSV)
-            if df.empty:
+            if count == 0:
                 continue
-                
-            # Convert timestamps
-            # Asumsi start_time dan finish_time di CSV sudah dalam seconds relative
             
-            makespan = df['finish_time'].max()
-            total_wait_time = df['wait_time'].sum()
-            avg_exec_time = df['exec_time'].mean()
+            avg_exec_time = total_exec_time / count
             
             # Hitung imbalance
-            vm_loads = df.groupby('vm_assigned')['exec_time'].sum()
-            imbalance = (vm_loads.max() - vm_loads.min()) / vm_loads.mean() if not vm_loads.empty else 0
+            loads = vm_loads.values()
+            avg_load = sum(loads) / len(loads)
+            imbalance = (max(loads) - min(loads)) / avg_load if avg_load else 0
             
             summary_data.append({
                 'Algorithm': algo.upper(),
@@ -107,11 +129,20 @@ def plot_comparison(df):
     print("Saved plot to comparison_imbalance.png")
 
 def main():
+    parser = argparse.ArgumentParser(description="Membandingkan performa algoritma scheduling.")
+    parser.add_argument('--parallel', action='store_true',
+                        help='Jalankan semua algoritma secara bersamaan (lebih cepat, namun VM dipakai bersama sehingga metrik bisa terpengaruh)')
+    args = parser.parse_args()
+    
     # 1. Run semua algoritma
-    for algo in ALGORITHMS:
-        run_algorithm(algo)
-        # Beri jeda sedikit agar tidak konflik resource (opsional)
-        time.sleep(1)
+    if args.parallel:
+        with ThreadPoolExecutor(max_workers=len(ALGORITHMS)) as executor:
+            list(executor.map(run_algorithm, ALGORITHMS))
+    else:
+        for algo in ALGORITHMS:
+            run_algorithm(algo)
+            # Beri jeda sedikit agar tidak konflik resource (opsional)
+            time.sleep(1)
         
     # 2. Collect metrics
     df = collect_metrics()
@@ -4,199 +4,323 @@ untuk Task Scheduling pada Sistem Heterogen
 """
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
-from collections import defaultdict
+from typing import List, Dict, Tuple, Optional, Union
 import math
 
+from base_scheduler import BaseScheduler, Task, ScheduleEvent
 
-@dataclass
-class Task:
-    """Representasi task dalam DAG"""
-    id: int
-    computation_cost: Dict[int, float]  # {processor_id: execution_time}
-    predecessors: List[int]  # List of task IDs yang harus selesai sebelum task ini
-    successors: List[int]  # List of task IDs yang bergantung pada task ini
+# Try to import numba
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
 
+    def njit(*args, **kwargs):
+        """Fallback tanpa numba: fungsi dijalankan sebagai Python biasa"""
+        def decorator(func):
+            return func
+        return decorator
 
-@dataclass
-class ScheduleEvent:
-    """Representasi event scheduling"""
-    task_id: int
-    processor_id: int
-    start_time: float
-    finish_time: float
 
+@njit(parallel=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'}, cache=True)
+def _avg_comp(cost_matrix):
+    """
+    Menghitung rata-rata computation cost per task secara paralel
+    
+    Flag fastmath sengaja tidak memuat 'nnan' karena NaN dipakai sebagai
+    penanda processor yang tidak memiliki cost.
+    
+    Args:
+        cost_matrix: Computation cost berukuran (N, P), NaN jika tidak ada cost
+        
+    Returns:
+        Array rata-rata cost berukuran (N,)
+    """
+    num_tasks, num_procs = cost_matrix.shape
+    out = np.empty(num_tasks)
+    for i in prange(num_tasks):
+        total = 0.0
+        count = 0
+        for j in range(num_procs):
+            value = cost_matrix[i, j]
+            if not math.isnan(value):
+                total += value
+                count += 1
+        out[i] = total / count if count > 0 else 0.0
+    return out
 
-class HEFTAlgorithm:
+
+@njit(cache=True)
+def _upward_rank_core(succ_offsets, succ_task_idx, avg_cost, comm_cost):
+    """
+    Kernel numerik Phase 2 HEFT: upward rank semua task
+    
+    Urutan topologis dibangun dengan algoritma Kahn, lalu rank dihitung
+    bottom-up dengan menelusuri urutan tersebut secara terbalik.
+    
+    Args:
+        succ_offsets: Offset CSR, successor task i ada di succ_task_idx[succ_offsets[i]:succ_offsets[i+1]]
+        succ_task_idx: Indeks successor dalam format CSR
+        avg_cost: Average computation cost per task berukuran (N,)
+        comm_cost: Average communication cost antar task
+        
+    Returns:
+        Tuple (ranks, num_ordered); num_ordered < N berarti DAG memiliki siklus
+    """
+    num_tasks = avg_cost.shape[0]
+    in_degree = np.zeros(num_tasks, dtype=np.int64)
+    for k in range(succ_task_idx.shape[0]):
+        in_degree[succ_task_idx[k]] += 1
+    
+    # Kahn: order sekaligus dipakai sebagai antrian FIFO
+    order = np.empty(num_tasks, dtype=np.int64)
+    tail = 0
+    for t in range(num_tasks):
+        if in_degree[t] == 0:
+            order[tail] = t
+            tail += 1
+    head = 0
+    while head < tail:
+        t = order[head]
+        head += 1
+        for k in range(succ_offsets[t], succ_offsets[t + 1]):
+            succ = succ_task_idx[k]
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                order[tail] = succ
+                tail += 1
+    
+    ranks = np.zeros(num_tasks)
+    for pos in range(tail - 1, -1, -1):
+        t = order[pos]
+        max_successor_rank = 0.0
+        for k in range(succ_offsets[t], succ_offsets[t + 1]):
+            successor_rank = ranks[succ_task_idx[k]] + comm_cost
+            if successor_rank > max_successor_rank:
+                max_successor_rank = successor_rank
+        ranks[t] = avg_cost[t] + max_successor_rank
+    
+    return ranks, tail
+
+
+@njit(cache=True, fastmath=True)
+def _schedule_core(sorted_task_ids, pred_offsets, pred_task_idx, comp_cost_2d, comm_mat, num_procs, no_comm):
+    """
+    Kernel numerik Phase 4 HEFT: assign setiap task ke processor dengan EFT terkecil
+    
+    Args:
+        sorted_task_ids: Indeks task terurut berdasarkan upward rank (descending)
+        pred_offsets: Offset CSR, predecessor task i ada di pred_task_idx[pred_offsets[i]:pred_offsets[i+1]]
+        pred_task_idx: Indeks predecessor dalam format CSR
+        comp_cost_2d: Computation cost berukuran (N, P)
+        comm_mat: Communication cost antar processor berukuran (P, P)
+        num_procs: Jumlah processor
+        no_comm: True jika seluruh communication cost 0; ready time predecessor
+            tidak bergantung pada processor sehingga cukup dihitung sekali per task
+        
+    Returns:
+        Tuple (assigned_proc, start_times, finish_times), diindeks berdasarkan indeks task
+    """
+    num_tasks = comp_cost_2d.shape[0]
+    avail = np.zeros(num_procs)
+    assigned_proc = np.full(num_tasks, -1, dtype=np.int64)
+    start_times = np.zeros(num_tasks)
+    finish_times = np.zeros(num_tasks)
+    
+    for t in sorted_task_ids:
+        # Tanpa communication cost: ready time = finish time predecessor terakhir
+        ready_all = 0.0
+        if no_comm:
+            for k in range(pred_offsets[t], pred_offsets[t + 1]):
+                pred = pred_task_idx[k]
+                if assigned_proc[pred] >= 0 and finish_times[pred] > ready_all:
+                    ready_all = finish_times[pred]
+        
+        best_proc = -1
+        best_est = 0.0
+        best_eft = 0.0
+        for p in range(num_procs):
+            est = avail[p]
+            if no_comm:
+                if ready_all > est:
+                    est = ready_all
+            else:
+                for k in range(pred_offsets[t], pred_offsets[t + 1]):
+                    pred = pred_task_idx[k]
+                    pred_proc = assigned_proc[pred]
+                    if pred_proc < 0:
+                        continue
+                    ready = finish_times[pred] + comm_mat[pred_proc, p]
+                    if ready > est:
+                        est = ready
+            eft = est + comp_cost_2d[t, p]
+            if best_proc < 0 or eft < best_eft:
+                best_proc = p
+                best_est = est
+                best_eft = eft
+        
+        assigned_proc[t] = best_proc
+        start_times[t] = best_est
+        finish_times[t] = best_eft
+        avail[best_proc] = best_eft
+    
+    return assigned_proc, start_times, finish_times
+
+
+class HEFTAlgorithm(BaseScheduler):
     """
     Implementasi algoritma HEFT untuk task scheduling pada sistem heterogen
     """
     
     def __init__(self, tasks: List[Task], processors: List[int], 
-                 communication_matrix: Optional[Dict[Tuple[int, int], float]] = None):
+                 communication_matrix: Optional[Union[Dict[Tuple[int, int], float], np.ndarray]] = None,
+                 cost_matrix: Optional[np.ndarray] = None):
         """
         Inisialisasi HEFT Algorithm
         
         Args:
             tasks: List of Task objects
             processors: List of processor IDs
-            communication_matrix: Dictionary mapping (from_proc, to_proc) -> communication_cost
+            communication_matrix: Dictionary mapping (from_proc, to_proc) -> communication_cost,
+                atau array dense berukuran (P, P) yang diindeks berdasarkan posisi processor
+            cost_matrix: (Opsional) computation cost dense berukuran (len(tasks), len(processors))
+                dengan urutan baris sesuai tasks dan kolom sesuai processors. Jika diberikan,
+                computation_cost tiap task tidak perlu dibaca ulang.
         """
+        super().__init__(processors)
         self.tasks = {task.id: task for task in tasks}
-        self.processors = processors
-        self.communication_matrix = communication_matrix or {}
-        self.schedule: Dict[int, ScheduleEvent] = {}  # task_id -> ScheduleEvent
-        self.processor_availability: Dict[int, float] = {p: 0.0 for p in processors}
+        self.communication_matrix = communication_matrix if communication_matrix is not None else {}
         self.avg_computation_cost: Dict[int, float] = {}
         self.upward_ranks: Dict[int, float] = {}
+        self._avg_cost_vec = np.zeros(len(self.tasks))
         
-    def _calculate_average_computation_cost(self):
-        """Menghitung rata-rata computation cost untuk setiap task"""
-        for task_id, task in self.tasks.items():
-            if task.computation_cost:
-                self.avg_computation_cost[task_id] = sum(task.computation_cost.values()) / len(task.computation_cost)
-            else:
-                self.avg_computation_cost[task_id] = 0.0
+        # State numerik yang diindeks berdasarkan posisi processor
+        self._comm_mat = self._build_communication_array()
+        self._avg_comm_cost = self._precompute_average_communication_cost()
+        # Tanpa communication cost, seluruh perhitungan communication cost bisa dilewati
+        self._no_comm = not self._comm_mat.any() and self._avg_comm_cost == 0.0
+        self._task_index = {task_id: i for i, task_id in enumerate(self.tasks)}
+        if cost_matrix is not None and cost_matrix.shape != (len(self.tasks), len(processors)):
+            raise ValueError(
+                f"Ukuran cost_matrix {cost_matrix.shape} tidak sesuai dengan "
+                f"({len(self.tasks)} tasks, {len(processors)} processors)"
+            )
+        self._input_cost_matrix = cost_matrix
+        self._cost_matrix = np.empty((0, len(processors)))
     
-    def _calculate_average_communication_cost(self, from_task_id: int, to_task_id: int) -> float:
+    def _build_communication_array(self) -> np.ndarray:
         """
-        Menghitung rata-rata communication cost antara dua task
+        Membangun communication matrix dense berukuran (P, P)
         
-        Args:
-            from_task_id: ID task sumber
-            to_task_id: ID task tujuan
-            
-        Returns:
-            Average communication cost
+        Communication cost antar processor yang sama selalu 0, begitu juga
+        pasangan yang tidak ada di communication_matrix.
         """
-        if not self.communication_matrix:
-            return 0.0
+        if isinstance(self.communication_matrix, np.ndarray):
+            num_procs = len(self.processors)
+            if self.communication_matrix.shape != (num_procs, num_procs):
+                raise ValueError(
+                    f"Ukuran communication_matrix {self.communication_matrix.shape} tidak sesuai "
+                    f"dengan jumlah processor ({num_procs})"
+                )
+            comm = np.array(self.communication_matrix, dtype=np.float64)
+            np.fill_diagonal(comm, 0.0)
+            return comm
         
-        # Jika ada communication cost spesifik antara processors
-        total_cost = 0.0
-        count = 0
+        comm = np.zeros((len(self.processors), len(self.processors)))
+        for (from_proc, to_proc), cost in self.communication_matrix.items():
+            if from_proc != to_proc and from_proc in self._proc_index and to_proc in self._proc_index:
+                comm[self._proc_index[from_proc], self._proc_index[to_proc]] = cost
+        return comm
         
-        for from_proc in self.processors:
-            for to_proc in self.processors:
-                if from_proc != to_proc:
-                    key = (from_proc, to_proc)
-                    if key in self.communication_matrix:
-                        total_cost += self.communication_matrix[key]
-                        count += 1
+    def _precompute_average_communication_cost(self) -> float:
+        """
+        Menghitung rata-rata communication cost antar processor yang berbeda.
+        
+        Nilainya hanya bergantung pada communication_matrix, sehingga cukup
+        dihitung sekali saat inisialisasi.
+        """
+        if isinstance(self.communication_matrix, np.ndarray):
+            num_procs = len(self.processors)
+            if num_procs < 2:
+                return 0.0
+            # Rata-rata elemen di luar diagonal (diagonal _comm_mat sudah 0)
+            return float(self._comm_mat.sum()) / (num_procs * (num_procs - 1))
         
-        if count > 0:
-            return total_cost / count
+        costs = [cost for (from_proc, to_proc), cost in self.communication_matrix.items()
+                 if from_proc != to_proc]
+        if costs:
+            return sum(costs) / len(costs)
         return 0.0
     
-    def _calculate_upward_rank(self, task_id: int) -> float:
+    def _calculate_average_computation_cost(self):
         """
-        Menghitung upward rank untuk task (recursive)
-        
-        Upward rank = avg_computation_cost + max(successor_rank + avg_communication_cost)
+        Menghitung rata-rata computation cost untuk setiap task
         
-        Args:
-            task_id: ID task yang akan dihitung rank-nya
-            
-        Returns:
-            Upward rank value
+        Sekaligus membangun cost matrix dengan fallback average yang sudah
+        diterapkan, sehingga perhitungan EFT tidak perlu branch fallback.
         """
-        if task_id in self.upward_ranks:
-            return self.upward_ranks[task_id]
-        
-        task = self.tasks[task_id]
-        
-        # Base case: jika tidak ada successor
-        if not task.successors:
-            self.upward_ranks[task_id] = self.avg_computation_cost[task_id]
-            return self.upward_ranks[task_id]
-        
-        # Recursive case: hitung max dari semua successor
-        max_successor_rank = 0.0
-        for successor_id in task.successors:
-            successor_rank = self._calculate_upward_rank(successor_id)
-            comm_cost = self._calculate_average_communication_cost(task_id, successor_id)
-            max_successor_rank = max(max_successor_rank, successor_rank + comm_cost)
-        
-        self.upward_ranks[task_id] = self.avg_computation_cost[task_id] + max_successor_rank
-        return self.upward_ranks[task_id]
+        if self._input_cost_matrix is not None:
+            raw_cost = np.asarray(self._input_cost_matrix, dtype=np.float64)
+        else:
+            raw_cost = self._build_cost_matrix()
+        avg_cost = _avg_comp(raw_cost)
+        self._avg_cost_vec = avg_cost
+        self.avg_computation_cost = dict(zip(self.tasks, avg_cost.tolist()))
+        self._cost_matrix = np.where(np.isnan(raw_cost), avg_cost[:, np.newaxis], raw_cost)
     
-    def _calculate_earliest_start_time(self, task_id: int, processor_id: int) -> float:
+    def _build_adjacency_csr(self, relation: str) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Menghitung earliest start time untuk task pada processor tertentu
+        Membangun daftar tetangga task dalam format CSR (offsets + indeks task)
         
         Args:
-            task_id: ID task
-            processor_id: ID processor
+            relation: 'predecessors' atau 'successors'
             
         Returns:
-            Earliest start time
+            Tuple (offsets, task_idx), tetangga task i ada di task_idx[offsets[i]:offsets[i+1]]
         """
-        task = self.tasks[task_id]
-        
-        # EST = max(processor_availability, max(predecessor_finish_time + communication_cost))
-        est = self.processor_availability[processor_id]
-        
-        # Cek semua predecessor
-        for pred_id in task.predecessors:
-            if pred_id in self.schedule:
-                pred_event = self.schedule[pred_id]
-                pred_finish_time = pred_event.finish_time
-                
-                # Jika predecessor di processor yang sama, tidak ada communication cost
-                if pred_event.processor_id == processor_id:
-                    comm_cost = 0.0
-                else:
-                    comm_key = (pred_event.processor_id, processor_id)
-                    comm_cost = self.communication_matrix.get(comm_key, 0.0)
-                
-                est = max(est, pred_finish_time + comm_cost)
-        
-        return est
+        task_index = self._task_index
+        offsets = np.zeros(len(task_index) + 1, dtype=np.int64)
+        task_idx = []
+        for task_id, i in task_index.items():
+            neighbors = [task_index[other_id] for other_id in getattr(self.tasks[task_id], relation)
+                         if other_id in task_index]
+            task_idx.extend(neighbors)
+            offsets[i + 1] = offsets[i] + len(neighbors)
+        return offsets, np.array(task_idx, dtype=np.int64)
     
-    def _calculate_earliest_finish_time(self, task_id: int, processor_id: int) -> float:
+    def _build_cost_matrix(self) -> np.ndarray:
         """
-        Menghitung earliest finish time untuk task pada processor tertentu
+        Membangun computation cost matrix dense berukuran (N, P)
+        
+        C[task_idx, proc_idx] berisi cost task pada processor tersebut, atau NaN
+        jika processor tidak memiliki cost untuk task itu.
         
-        Args:
-            task_id: ID task
-            processor_id: ID processor
-            
         Returns:
-            Earliest finish time
+            Cost matrix float64
         """
-        task = self.tasks[task_id]
-        est = self._calculate_earliest_start_time(task_id, processor_id)
-        execution_time = task.computation_cost.get(processor_id, float('inf'))
-        
-        if execution_time == float('inf'):
-            # Jika processor tidak memiliki cost untuk task ini, gunakan average
-            execution_time = self.avg_computation_cost[task_id]
-        
-        return est + execution_time
+        return np.array(
+            [[task.computation_cost.get(p, np.nan) for p in self.processors] for task in self.tasks.values()],
+            dtype=np.float64
+        ).reshape(len(self.tasks), len(self.processors))
     
-    def _select_best_processor(self, task_id: int) -> Tuple[int, float, float]:
+    def _compute_upward_ranks_iterative(self):
         """
-        Memilih processor terbaik untuk task berdasarkan earliest finish time
+        Menghitung upward rank untuk semua task secara iteratif
         
-        Args:
-            task_id: ID task
-            
-        Returns:
-            Tuple (best_processor_id, earliest_start_time, earliest_finish_time)
-        """
-        best_processor = None
-        best_eft = float('inf')
-        best_est = 0.0
+        Upward rank = avg_computation_cost + max(successor_rank + avg_communication_cost)
         
-        for processor_id in self.processors:
-            eft = self._calculate_earliest_finish_time(task_id, processor_id)
-            if eft < best_eft:
-                best_eft = eft
-                best_processor = processor_id
-                best_est = self._calculate_earliest_start_time(task_id, processor_id)
+        Urutan topologis (algoritma Kahn) dan rank bottom-up dihitung oleh
+        kernel _upward_rank_core di atas daftar successor dalam format CSR.
+        """
+        succ_offsets, succ_task_idx = self._build_adjacency_csr('successors')
+        # Average communication cost tidak bergantung pada pasangan task, cukup diambil sekali
+        ranks, num_ordered = _upward_rank_core(succ_offsets, succ_task_idx, self._avg_cost_vec, self._avg_comm_cost)
+        if num_ordered != len(self.tasks):
+            raise ValueError("DAG tidak valid: terdapat siklus pada dependensi task.")
         
-        return best_processor, best_est, best_eft
+        self.upward_ranks = dict(zip(self.tasks, ranks.tolist()))
     
     def schedule_tasks(self) -> Dict[int, ScheduleEvent]:
         """
@@ -209,64 +333,56 @@ class HEFTAlgorithm:
         self._calculate_average_computation_cost()
         
         # Phase 2: Hitung upward rank untuk semua tasks
-        for task_id in self.tasks.keys():
-            self._calculate_upward_rank(task_id)
+        self._compute_upward_ranks_iterative()
         
         # Phase 3: Sort tasks berdasarkan upward rank (descending)
-        sorted_tasks = sorted(
-            self.tasks.keys(),
-            key=lambda tid: self.upward_ranks[tid],
-            reverse=True
-        )
+        sorted_tasks = sorted(self.tasks, key=self.upward_ranks.__getitem__, reverse=True)
         
         # Phase 4: Schedule setiap task ke processor terbaik
+        if not self.tasks:
+            return self.schedule
+        
+        task_index = self._task_index
+        pred_offsets, pred_task_idx = self._build_adjacency_csr('predecessors')
+        sorted_task_ids = np.array([task_index[task_id] for task_id in sorted_tasks], dtype=np.int64)
+        
+        assigned_proc, start_times, finish_times = _schedule_core(
+            sorted_task_ids, pred_offsets, pred_task_idx, self._cost_matrix, self._comm_mat,
+            len(self.processors), self._no_comm
+        )
+        
+        # Bangun kembali ScheduleEvent dari hasil kernel
         for task_id in sorted_tasks:
-            best_processor, est, eft = self._select_best_processor(task_id)
-            
-            # Buat schedule event
-            event = ScheduleEvent(
-                task_id=task_id,
-                processor_id=best_processor,
-                start_time=est,
-                finish_time=eft
-            )
-            
-            self.schedule[task_id] = event
-            self.processor_availability[best_processor] = eft
+            i = task_index[task_id]
+            proc_idx = int(assigned_proc[i])
+            self._assign(task_id, proc_idx, self._cost_matrix[i, proc_idx], start_times[i])
         
         return self.schedule
     
-    def get_makespan(self) -> float:
-        """Menghitung makespan (total waktu penyelesaian)"""
-        if not self.schedule:
-            return 0.0
-        return max(event.finish_time for event in self.schedule.values())
-    
     def get_schedule_summary(self) -> Dict:
         """Mendapatkan summary dari schedule"""
         if not self.schedule:
             return {}
         
-        processor_loads = defaultdict(list)
-        for event in self.schedule.values():
-            processor_loads[event.processor_id].append({
+        # Satu kali traversal untuk processor_loads dan schedule sekaligus
+        processor_loads: Dict[int, list] = {}
+        schedule_out = {}
+        for task_id, event in self.schedule.items():
+            processor_loads.setdefault(event.processor_id, []).append({
                 'task_id': event.task_id,
                 'start_time': event.start_time,
                 'finish_time': event.finish_time,
                 'duration': event.finish_time - event.start_time
             })
+            schedule_out[task_id] = {
+                'processor_id': event.processor_id,
+                'start_time': event.start_time,
+                'finish_time': event.finish_time
+            }
         
         return {
-            'makespan': self.get_makespan(),
+            'makespan': self._makespan,
             'total_tasks': len(self.schedule),
-            'processor_loads': dict(processor_loads),
-            'schedule': {
-                task_id: {
-                    'processor_id': event.processor_id,
-                    'start_time': event.start_time,
-                    'finish_time': event.finish_time
-                }
-                for task_id, event in self.schedule.items()
-            }
+            'processor_loads': processor_loads,
+            'schedule': schedule_out
         }
-
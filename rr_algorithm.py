@@ -4,12 +4,13 @@ untuk Task Scheduling
 """
 
 from typing import List, Dict
-from heft_algorithm import Task, ScheduleEvent
+from base_scheduler import BaseScheduler, Task, ScheduleEvent
 
-class RRAlgorithm:
+class RRAlgorithm(BaseScheduler):
     """
     Implementasi algoritma Round Robin untuk task scheduling.
     Tasks didistribusikan secara bergilir ke setiap processor.
+    Pemilihan processor memakai aritmetika indeks sehingga sudah O(1) per task.
     """
     
     def __init__(self, tasks: List[Task], processors: List[int]):
@@ -20,10 +21,8 @@ class RRAlgorithm:
             tasks: List of Task objects
             processors: List of processor IDs
         """
+        super().__init__(processors)
         self.tasks = sorted(tasks, key=lambda t: t.id)
-        self.processors = processors
-        self.schedule: Dict[int, ScheduleEvent] = {}
-        self.processor_availability: Dict[int, float] = {p: 0.0 for p in processors}
         
     def schedule_tasks(self) -> Dict[int, ScheduleEvent]:
         """
@@ -33,35 +32,33 @@ class RRAlgorithm:
             Dictionary mapping task_id -> ScheduleEvent
         """
         num_processors = len(self.processors)
+        processors = self.processors
+        schedule = self.schedule
+        # State BaseScheduler diakses lewat variabel lokal selama loop (list
+        # availability di-update in place); makespan disinkronkan sekali di akhir
+        avail = self._avail
+        makespan = self._makespan
         
         for i, task in enumerate(self.tasks):
             # Pilih processor secara bergilir (Round Robin)
             processor_idx = i % num_processors
-            processor_id = self.processors[processor_idx]
+            processor_id = processors[processor_idx]
             
-            start_time = self.processor_availability[processor_id]
+            start_time = avail[processor_idx]
             
-            # Hitung execution time
-            exec_time = task.computation_cost.get(processor_id, 0.0)
-            if exec_time == 0.0 and task.computation_cost:
-                 exec_time = sum(task.computation_cost.values()) / len(task.computation_cost)
-
+            # Hitung execution time; setiap task hanya dijadwalkan sekali sehingga
+            # fallback rata-rata cukup dihitung saat dibutuhkan
+            costs = task.computation_cost
+            exec_time = costs.get(processor_id, 0.0)
+            if not exec_time:
+                exec_time = sum(costs.values()) / len(costs) if costs else 0.0
             finish_time = start_time + exec_time
             
             # Update schedule
-            event = ScheduleEvent(
-                task_id=task.id,
-                processor_id=processor_id,
-                start_time=start_time,
-                finish_time=finish_time
-            )
-            self.schedule[task.id] = event
-            self.processor_availability[processor_id] = finish_time
-            
-        return self.schedule
-
-    def get_makespan(self) -> float:
-        """Menghitung makespan"""
-        if not self.schedule:
-            return 0.0
-        return max(event.finish_time for event in self.schedule.values())
+            schedule[task.id] = ScheduleEvent(task.id, processor_id, start_time, finish_time)
+            avail[processor_idx] = finish_time
+            if finish_time > makespan:
+                makespan = finish_time
+        
+        self._makespan = makespan
+        return schedule
@@ -6,20 +6,26 @@ untuk penentuan jadwal dengan eksekutor asinkron paralel.
 import asyncio
 import httpx
 import time
-from datetime import datetime
-import csv
+import numpy as np
 import pandas as pd
 import sys
 import os
 import argparse
+import heapq
 from dotenv import load_dotenv
 from collections import namedtuple
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+# Try to import uvloop (event loop berbasis libuv, lebih sedikit overhead syscall)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Impor algoritma
 from heft_algorithm import HEFTAlgorithm, Task as HeftTask, ScheduleEvent
-from shc_algorithm import SHCAlgorithm
 from rr_algorithm import RRAlgorithm
 from fcfs_algorithm import FCFSAlgorithm
 
@@ -34,6 +40,13 @@ VM_SPECS = {
 }
 
 VM_PORT = int(os.getenv('VM_PORT', 5000))
+# Log per tugas (mulai/selesai) hanya dicetak jika VERBOSE=1, agar jalur eksekusi
+# asinkron tidak tertahan oleh write ke stdout untuk setiap tugas
+VERBOSE = os.getenv('VERBOSE', '0').lower() in ('1', 'true', 'yes')
+TASK_TIMEOUT = 300.0
+CONNECT_TIMEOUT = 5.0
+KEEPALIVE_EXPIRY = 60.0
+CONNECT_RETRIES = 2
 RESULTS_FILE_PREFIX = 'results_'
 
 # Definisi Tipe Data
@@ -42,10 +55,37 @@ Task = namedtuple('Task', ['id', 'name', 'index', 'cpu_load'])
 
 # --- Fungsi Helper & Definisi Task ---
 
+# Beban CPU untuk indeks task 1-10 (index * index * 10000), dihitung sekali;
+# elemen 0 tidak dipakai agar tabel bisa diindeks langsung dengan indeks task
+_TASK_LOADS = [index * index * 10000 for index in range(11)]
+
 def get_task_load(index: int):
-    """Menghitung beban CPU berdasarkan indeks task."""
-    cpu_load = (index * index * 10000)
-    return cpu_load
+    """Mengambil beban CPU berdasarkan indeks task (1-10)."""
+    return _TASK_LOADS[index]
+
+def _load_tasks_per_line(dataset_path: str, lines: list[str]) -> list[Task]:
+    """Parsing per baris untuk dataset yang berisi baris kosong/tidak valid."""
+    tasks = []
+    for i, line in enumerate(lines):
+        try:
+            index = int(line.strip())
+            if not 1 <= index <= 10:
+                print(f"Peringatan: Task index {index} di baris {i+1} di luar rentang (1-10).")
+                continue
+            
+            cpu_load = get_task_load(index)
+            task_name = f"task-{index}-{i}"
+            tasks.append(Task(
+                id=i,
+                name=task_name,
+                index=index,
+                cpu_load=cpu_load,
+            ))
+        except ValueError:
+            print(f"Peringatan: Mengabaikan baris {i+1} yang tidak valid: '{line.strip()}'")
+    
+    print(f"Berhasil memuat {len(tasks)} tugas dari {dataset_path}")
+    return tasks
 
 def load_tasks(dataset_path: str) -> list[Task]:
     """Memuat daftar tugas dari file dataset."""
@@ -53,25 +93,29 @@ def load_tasks(dataset_path: str) -> list[Task]:
         print(f"Error: File dataset '{dataset_path}' tidak ditemukan.", file=sys.stderr)
         sys.exit(1)
         
-    tasks = []
     with open(dataset_path, 'r') as f:
-        for i, line in enumerate(f):
-            try:
-                index = int(line.strip())
-                if not 1 <= index <= 10:
-                    print(f"Peringatan: Task index {index} di baris {i+1} di luar rentang (1-10).")
-                    continue
-                
-                cpu_load = get_task_load(index)
-                task_name = f"task-{index}-{i}"
-                tasks.append(Task(
-                    id=i,
-                    name=task_name,
-                    index=index,
-                    cpu_load=cpu_load,
-                ))
-            except ValueError:
-                print(f"Peringatan: Mengabaikan baris {i+1} yang tidak valid: '{line.strip()}'")
+        lines = f.read().splitlines()
+    
+    # Jalur cepat: parsing seluruh file sekaligus secara vektorial. Jika ada baris
+    # kosong/tidak valid, kembali ke parsing per baris agar nomor baris (id) tetap sama
+    try:
+        indices = np.loadtxt(lines, dtype=np.int64, comments=None, ndmin=1) if lines else None
+    except ValueError:
+        indices = None
+    if indices is None or indices.ndim != 1 or len(indices) != len(lines):
+        return _load_tasks_per_line(dataset_path, lines)
+    
+    mask = (indices >= 1) & (indices <= 10)
+    for i in np.flatnonzero(~mask).tolist():
+        print(f"Peringatan: Task index {indices[i]} di baris {i+1} di luar rentang (1-10).")
+    
+    line_ids = np.flatnonzero(mask)
+    valid = indices[mask]
+    cpu_loads = np.take(_TASK_LOADS, valid)
+    tasks = [
+        Task(id=i, name=f"task-{index}-{i}", index=index, cpu_load=cpu_load)
+        for i, index, cpu_load in zip(line_ids.tolist(), valid.tolist(), cpu_loads.tolist())
+    ]
     
     print(f"Berhasil memuat {len(tasks)} tugas dari {dataset_path}")
     return tasks
@@ -88,6 +132,8 @@ class TaskScheduler:
         """Inisialisasi scheduler dengan konfigurasi dari .env"""
         self.vms = self._load_vms()
         self.processors = [vm.name for vm in self.vms]
+        self.proc_index = {name: i for i, name in enumerate(self.processors)}
+        self.vms_by_name = {vm.name: vm for vm in self.vms}
         self.communication_matrix = self._initialize_communication_matrix()
         
     def _load_vms(self) -> List[VM]:
@@ -109,38 +155,53 @@ class TaskScheduler:
         print(f"Loaded {len(vms)} VM(s): {[vm.name for vm in vms]}")
         return vms
     
-    def _initialize_communication_matrix(self) -> Dict[tuple, float]:
-        """Inisialisasi communication matrix antar processor (VM)."""
-        matrix = {}
-        for from_proc in self.processors:
-            for to_proc in self.processors:
-                if from_proc != to_proc:
-                    matrix[(from_proc, to_proc)] = 1.0
-        return matrix
+    def _initialize_communication_matrix(self) -> np.ndarray:
+        """
+        Inisialisasi communication matrix antar processor (VM).
+        
+        Array dense (P, P) yang diindeks berdasarkan posisi processor
+        (lihat self.proc_index); cost 1.0 antar VM berbeda dan 0 pada diagonal.
+        """
+        return 1.0 - np.eye(len(self.processors))
     
-    def _create_task_dag(self, tasks: List[Task]) -> List[HeftTask]:
-        """Membuat DAG dengan struktur 'Parallel Chains'."""
-        heft_tasks = []
+    def _create_task_dag(self, tasks: List[Task]) -> Tuple[List[HeftTask], np.ndarray]:
+        """
+        Membuat DAG dengan struktur 'Parallel Chains'.
+        
+        Returns:
+            Tuple (heft_tasks, cost_matrix), cost_matrix[i, j] adalah
+            computation cost tugas ke-i pada VM ke-j (urutan self.vms)
+        """
         num_tasks = len(tasks)
         num_chains = 4 
         
-        for i, task in enumerate(tasks):
-            predecessors = [tasks[i - num_chains].id] if i >= num_chains else []
-            successors = [tasks[i + num_chains].id] if i + num_chains < num_tasks else []
-            
-            computation_cost = {}
-            for vm in self.vms:
-                computation_cost[vm.name] = task.cpu_load / vm.cpu_cores
-            
-            heft_task_obj = HeftTask(
-                id=task.id,
-                computation_cost=computation_cost,
-                predecessors=predecessors,
-                successors=successors
+        # Computation cost semua (task, VM) dihitung sekaligus: cpu_load / cpu_cores
+        cpu_loads = np.array([task.cpu_load for task in tasks], dtype=np.float64)
+        cpu_cores = np.array([vm.cpu_cores for vm in self.vms], dtype=np.float64)
+        cost_matrix = cpu_loads[:, np.newaxis] / cpu_cores[np.newaxis, :]
+        
+        # Predecessor/successor tiap posisi dihitung vektorial (-1 = tidak ada):
+        # posisi i bergantung pada posisi i - num_chains di rantai yang sama.
+        # Nilainya adalah task id (id tidak selalu sama dengan posisi)
+        task_ids = np.array([task.id for task in tasks], dtype=np.int64)
+        pred_ids = np.full(num_tasks, -1, dtype=np.int64)
+        succ_ids = np.full(num_tasks, -1, dtype=np.int64)
+        pred_ids[num_chains:] = task_ids[:-num_chains]
+        succ_ids[:-num_chains] = task_ids[num_chains:]
+        
+        heft_tasks = [
+            HeftTask(
+                id=task_id,
+                computation_cost=dict(zip(self.processors, costs)),
+                predecessors=[] if pred < 0 else [pred],
+                successors=[] if succ < 0 else [succ]
             )
-            heft_tasks.append(heft_task_obj)
+            for task_id, costs, pred, succ in zip(
+                task_ids.tolist(), cost_matrix.tolist(), pred_ids.tolist(), succ_ids.tolist()
+            )
+        ]
         
-        return heft_tasks
+        return heft_tasks, cost_matrix
     
     def run_scheduler(self, tasks: List[Task], algorithm_name: str) -> Dict[int, str]:
         """
@@ -158,7 +219,7 @@ class TaskScheduler:
         print("=" * 60)
         
         # 1. Buat DAG/Task Objects yang dibutuhkan
-        heft_tasks = self._create_task_dag(tasks)
+        heft_tasks, cost_matrix = self._create_task_dag(tasks)
         
         # 2. Inisialisasi Algorithm
         algo_instance = None
@@ -166,9 +227,12 @@ class TaskScheduler:
             algo_instance = HEFTAlgorithm(
                 tasks=heft_tasks,
                 processors=self.processors,
-                communication_matrix=self.communication_matrix
+                communication_matrix=self.communication_matrix,
+                cost_matrix=cost_matrix
             )
         elif algorithm_name == 'shc':
+            # Impor di sini agar warm-up kernel SHC hanya terjadi saat SHC dipakai
+            from shc_algorithm import SHCAlgorithm
             algo_instance = SHCAlgorithm(
                 tasks=heft_tasks,
                 processors=self.processors
@@ -188,7 +252,12 @@ class TaskScheduler:
         
         # 3. Jalankan scheduling
         print(f"\n=== Phase 1: Scheduling ({algorithm_name.upper()}) ===")
-        schedule = algo_instance.schedule_tasks()
+        if algorithm_name == 'shc':
+            # SHC: assignment dibaca langsung dari hasil search, tanpa ScheduleEvent
+            algo_instance.search()
+            schedule = None
+        else:
+            schedule = algo_instance.schedule_tasks()
         
         # 4. Tampilkan hasil scheduling
         print(f"\n=== Hasil Scheduling ({algorithm_name.upper()}) ===")
@@ -196,13 +265,14 @@ class TaskScheduler:
         print(f"Perkiraan Makespan: {makespan:.2f}")
         
         # 5. Konversi schedule ke assignment
-        assignment = {}
-        for task_id, event in schedule.items():
-            assignment[task_id] = event.processor_id
+        if schedule is None:
+            assignment = algo_instance.get_assignment()
+        else:
+            assignment = {task_id: event.processor_id for task_id, event in schedule.items()}
         
         print("\nPenugasan Tugas dari Scheduler (akan dieksekusi secara paralel):")
-        # Tampilkan 10 pertama
-        for task_id in sorted(assignment.keys())[:10]:
+        # Tampilkan 10 pertama (tanpa mengurutkan seluruh assignment)
+        for task_id in heapq.nsmallest(10, assignment):
              print(f"  - Tugas {task_id} -> {assignment[task_id]}")
         if len(assignment) > 10:
             print("  - ... etc.")
@@ -211,50 +281,79 @@ class TaskScheduler:
 
 # --- Eksekutor Tugas Asinkron ---
 
-async def execute_task_on_vm(task: Task, vm: VM, client: httpx.AsyncClient, 
-                             vm_semaphore: asyncio.Semaphore, results_list: list):
+async def execute_task_on_vm(task: Task, vm: VM, client: httpx.AsyncClient,
+                             results_list: list, queued_at: Optional[float] = None):
     """Mengirim request GET ke VM yang ditugaskan."""
     url = f"http://{vm.ip}:{VM_PORT}/task/{task.index}"
-    task_start_time = None
-    task_finish_time = None
+    task_start_ns = None
+    task_finish_ns = None
     task_exec_time = -1.0
     task_wait_time = -1.0
     
-    wait_start_mono = time.monotonic()
+    # Wait time dihitung sejak tugas masuk antrian VM sampai diambil worker
+    wait_start_mono = queued_at if queued_at is not None else time.monotonic()
     
     try:
-        async with vm_semaphore:
-            task_wait_time = time.monotonic() - wait_start_mono
+        task_wait_time = time.monotonic() - wait_start_mono
+        if VERBOSE:
             print(f"Mengeksekusi {task.name} (idx: {task.id}) di {vm.name} (IP: {vm.ip})...")
-            
-            task_start_mono = time.monotonic()
-            task_start_time = datetime.now()
-            
-            response = await client.get(url, timeout=300.0)
-            response.raise_for_status()
-            
-            task_finish_time = datetime.now()
-            task_exec_time = time.monotonic() - task_start_mono
-            
+        
+        task_start_mono = time.monotonic()
+        task_start_ns = time.time_ns()
+        
+        response = await client.get(url)
+        response.raise_for_status()
+        
+        task_finish_ns = time.time_ns()
+        task_exec_time = time.monotonic() - task_start_mono
+        
+        if VERBOSE:
             print(f"Selesai {task.name} (idx: {task.id}) di {vm.name}. Waktu: {task_exec_time:.4f}s")
-            
+        
     except Exception as e:
         print(f"Error pada {task.name} di {vm.name}: {e}", file=sys.stderr)
         
     finally:
-        if task_start_time is None: task_start_time = datetime.now()
-        if task_finish_time is None: task_finish_time = datetime.now()
+        # Timestamp disimpan sebagai epoch nanodetik (int), bukan objek datetime
+        if task_start_ns is None: task_start_ns = time.time_ns()
+        if task_finish_ns is None: task_finish_ns = time.time_ns()
             
         results_list.append({
             "index": task.id,
             "task_name": task.name,
             "vm_assigned": vm.name,
-            "start_time": task_start_time,
+            "start_time": task_start_ns,
             "exec_time": task_exec_time,
-            "finish_time": task_finish_time,
+            "finish_time": task_finish_ns,
             "wait_time": task_wait_time
         })
 
+async def run_vm_tasks(vm_tasks: List[Task], vm: VM, client: httpx.AsyncClient, results_list: list):
+    """
+    Menjalankan semua tugas satu VM lewat antrian per VM.
+    
+    Semua tugas dimasukkan ke asyncio.Queue milik VM, lalu sebanyak cpu_cores
+    worker persisten mengambil dan mengeksekusinya satu per satu, sehingga
+    paralelisme per VM sama dengan jumlah core tanpa semaphore per tugas.
+    Setiap VM punya antrian sendiri agar VM yang sibuk tidak menahan VM lain.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for task in vm_tasks:
+        queue.put_nowait(task)
+    # Satu sentinel per worker sebagai tanda antrian habis
+    for _ in range(vm.cpu_cores):
+        queue.put_nowait(None)
+    queued_at = time.monotonic()
+    
+    async def worker():
+        while True:
+            task = await queue.get()
+            if task is None:
+                return
+            await execute_task_on_vm(task, vm, client, results_list, queued_at)
+    
+    await asyncio.gather(*(worker() for _ in range(vm.cpu_cores)))
+
 # --- Fungsi Paska-Proses & Metrik ---
 
 def write_results_to_csv(results_list: list, algorithm_name: str):
@@ -263,26 +362,19 @@ def write_results_to_csv(results_list: list, algorithm_name: str):
         print("Tidak ada hasil untuk ditulis ke CSV.", file=sys.stderr)
         return
 
-    results_list.sort(key=lambda x: x['index'])
     headers = ["index", "task_name", "vm_assigned", "start_time", "exec_time", "finish_time", "wait_time"]
     
-    formatted_results = []
-    min_start = min(item['start_time'] for item in results_list)
-    for r in results_list:
-        new_r = r.copy()
-        new_r['start_time'] = (r['start_time'] - min_start).total_seconds()
-        new_r['finish_time'] = (r['finish_time'] - min_start).total_seconds()
-        formatted_results.append(new_r)
-
-    formatted_results.sort(key=lambda item: item['start_time'])
+    # Waktu relatif terhadap tugas pertama dihitung sekaligus untuk semua baris
+    df = pd.DataFrame(results_list, columns=headers)
+    min_start = df['start_time'].min()
+    df['start_time'] = (df['start_time'] - min_start) / 1e9
+    df['finish_time'] = (df['finish_time'] - min_start) / 1e9
+    df = df.sort_values(['start_time', 'index'])
     
     filename = f"{RESULTS_FILE_PREFIX}{algorithm_name}.csv"
 
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(formatted_results)
+        df.to_csv(filename, index=False, float_format='%.6f', encoding='utf-8')
         print(f"\nData hasil eksekusi disimpan ke {filename}")
     except IOError as e:
         print(f"Error menulis ke CSV {filename}: {e}", file=sys.stderr)
@@ -298,6 +390,10 @@ def calculate_and_print_metrics(results_list: list, vms: list[VM], total_schedul
         print("Error: Library 'pandas' tidak ditemukan. Harap install pandas untuk menghitung metrik.", file=sys.stderr)
         return
 
+    if df.empty:
+        print("Error: Hasil kosong, tidak ada metrik untuk dihitung.", file=sys.stderr)
+        return
+
     success_df = df[df['exec_time'] > 0].copy()
     if success_df.empty:
         print("Tidak ada tugas yang berhasil diselesaikan. Metrik tidak dapat dihitung.")
@@ -312,8 +408,8 @@ def calculate_and_print_metrics(results_list: list, vms: list[VM], total_schedul
     
     # Calculate Relative Times
     min_start_time = success_df['start_time'].min()
-    relative_start_times = (success_df['start_time'] - min_start_time).dt.total_seconds()
-    relative_finish_times = (success_df['finish_time'] - min_start_time).dt.total_seconds()
+    relative_start_times = (success_df['start_time'] - min_start_time) / 1e9
+    relative_finish_times = (success_df['finish_time'] - min_start_time) / 1e9
     
     avg_start_time_rel = relative_start_times.mean()
     avg_finish_time_rel = relative_finish_times.mean()
@@ -360,16 +456,34 @@ async def main():
     # 2. Jalankan Algoritma Penjadwalan
     scheduler = TaskScheduler()
     vms = scheduler.vms
-    vms_dict = {vm.name: vm for vm in vms}
+    vms_dict = scheduler.vms_by_name
 
     best_assignment = scheduler.run_scheduler(tasks, args.algo)
     
     # 3. Siapkan Eksekusi
     results_list = []
-    vm_semaphores = {vm.name: asyncio.Semaphore(vm.cpu_cores) for vm in vms}
     
-    async with httpx.AsyncClient() as client:
-        all_task_coroutines = []
+    # Pool koneksi disesuaikan dengan jumlah maksimum request paralel (total core semua VM)
+    # agar koneksi keep-alive dipakai ulang dan tidak ada handshake TCP per tugas
+    max_inflight = sum(vm.cpu_cores for vm in vms)
+    limits = httpx.Limits(
+        max_connections=max_inflight,
+        max_keepalive_connections=max_inflight,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+    timeout = httpx.Timeout(TASK_TIMEOUT, connect=CONNECT_TIMEOUT)
+    # Retry hanya untuk kegagalan koneksi, sehingga request tugas tidak pernah terkirim dua kali
+    transport = httpx.AsyncHTTPTransport(limits=limits, retries=CONNECT_RETRIES)
+    
+    async with httpx.AsyncClient(transport=transport, timeout=timeout) as client:
+        # Pre-warm: buka koneksi ke setiap VM sebelum pengukuran makespan dimulai
+        await asyncio.gather(
+            *(client.head(f"http://{vm.ip}:{VM_PORT}/") for vm in vms),
+            return_exceptions=True
+        )
+        
+        tasks_per_vm = {vm.name: [] for vm in vms}
+        num_tasks = 0
         for task_id, vm_name in best_assignment.items():
             if task_id not in tasks_dict:
                 print(f"Peringatan: task_id {task_id} dari scheduler tidak ada di tasks_dict.")
@@ -378,19 +492,17 @@ async def main():
                 print(f"Peringatan: vm_name {vm_name} dari scheduler tidak ada di vms_dict.")
                 continue
 
-            task = tasks_dict[task_id]
-            vm = vms_dict[vm_name]
-            sem = vm_semaphores[vm_name]
-            
-            all_task_coroutines.append(
-                execute_task_on_vm(task, vm, client, sem, results_list)
-            )
+            tasks_per_vm[vm_name].append(tasks_dict[task_id])
+            num_tasks += 1
             
-        print(f"\nMemulai eksekusi {len(all_task_coroutines)} tugas secara paralel...")
+        print(f"\nMemulai eksekusi {num_tasks} tugas secara paralel...")
         
-        # 4. Jalankan Semua Tugas
+        # 4. Jalankan Semua Tugas (cpu_cores worker per VM)
         schedule_start_time = time.monotonic()
-        await asyncio.gather(*all_task_coroutines)
+        await asyncio.gather(*(
+            run_vm_tasks(vm_tasks, vms_dict[vm_name], client, results_list)
+            for vm_name, vm_tasks in tasks_per_vm.items() if vm_tasks
+        ))
         schedule_end_time = time.monotonic()
         total_schedule_time = schedule_end_time - schedule_start_time
         
@@ -401,4 +513,7 @@ async def main():
     calculate_and_print_metrics(results_list, vms, total_schedule_time)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
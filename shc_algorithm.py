@@ -1,7 +1,71 @@
-import random
-import copy
-from typing import List, Dict, Tuple
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from heft_algorithm import Task, ScheduleEvent
+from shc_kernel import shc_inner
+
+# Try to import numba
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback tanpa numba: fungsi dijalankan sebagai Python biasa"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Kernel SHC: pakai modul hasil kompilasi AOT (python shc_kernel.py) jika ada,
+# jika tidak dikompilasi JIT dengan cache di disk
+try:
+    from shc_kernel_aot import shc_inner as _shc_inner
+    SHC_KERNEL_AOT = True
+except ImportError:
+    SHC_KERNEL_AOT = False
+    _shc_inner = njit(cache=True)(shc_inner)
+
+
+def _run_one(exec_mat: np.ndarray, max_iter: int, tasks_per_step: int,
+             initial_temperature: float, patience: int, seed) -> Tuple[float, np.ndarray]:
+    """
+    Menjalankan satu climber SHC secara mandiri (dapat dipanggil di proses lain)
+    
+    Hanya menerima dan mengembalikan array, sehingga murah dikirim antar proses.
+    
+    Args:
+        exec_mat: Execution time berukuran (N, P)
+        max_iter: Jumlah iterasi
+        tasks_per_step: Jumlah task acak yang dievaluasi per iterasi
+        initial_temperature: Temperatur awal kriteria Metropolis
+        patience: Jumlah iterasi tanpa perbaikan sebelum berhenti
+        seed: Seed (int, SeedSequence, atau None) untuk numpy Generator
+        
+    Returns:
+        Tuple (best_makespan, best_assignment)
+    """
+    rng = np.random.default_rng(seed)
+    num_tasks, num_procs = exec_mat.shape
+    
+    # Initial Solution: Random Assignment (indeks processor per indeks task)
+    initial = rng.integers(0, num_procs, size=num_tasks, dtype=np.int32)
+    
+    # Semua pilihan acak di-draw sekaligus
+    num_draws = max_iter * tasks_per_step if num_tasks else 0
+    task_choices = rng.integers(0, num_tasks, size=num_draws, dtype=np.int32)
+    accept_u = rng.random(max_iter if num_tasks else 0)
+    
+    best, best_mk = _shc_inner(
+        exec_mat, initial, task_choices, accept_u,
+        max_iter, tasks_per_step, initial_temperature, patience
+    )
+    return best_mk, best
+
+
+# Temperatur awal default = skala ini dikali rata-rata execution time task
+DEFAULT_TEMPERATURE_SCALE = 0.5
 
 class SHCAlgorithm:
     """
@@ -9,7 +73,9 @@ class SHCAlgorithm:
     Mencari solusi optimal lokal dengan melakukan mutasi acak pada assignment.
     """
     
-    def __init__(self, tasks: List[Task], processors: List[int], max_iterations: int = 1000):
+    def __init__(self, tasks: List[Task], processors: List[int], max_iterations: int = 1000,
+                 tasks_per_step: int = 4, seed: Optional[int] = None,
+                 temperature: Optional[float] = None, patience: Optional[int] = None):
         """
         Inisialisasi SHC Algorithm
         
@@ -17,50 +83,133 @@ class SHCAlgorithm:
             tasks: List of Task objects
             processors: List of processor IDs
             max_iterations: Jumlah iterasi maksimum untuk pencarian solusi
+            tasks_per_step: Jumlah task acak per iterasi; setiap task dievaluasi
+                untuk semua processor tujuan
+            seed: Seed random generator (None = acak)
+            temperature: Temperatur awal kriteria Metropolis (None = otomatis dari
+                rata-rata execution time, 0 = hanya terima neighbor yang tidak lebih buruk)
+            patience: Berhenti jika solusi terbaik tidak membaik selama sekian iterasi
+                (default: max_iterations // 4, 0 = selalu jalankan max_iterations)
         """
         self.tasks = tasks
         self.processors = processors
         self.max_iterations = max_iterations
-        self.best_schedule: Dict[int, ScheduleEvent] = {}
+        self.tasks_per_step = max(1, tasks_per_step)
+        self.seed = seed
+        self.temperature = temperature
+        self.patience = max_iterations // 4 if patience is None else patience
         self.best_makespan = float('inf')
+        # Schedule terbaik dibangun lazily dari _best_assignment (lihat best_schedule)
+        self._best_schedule: Optional[Dict[int, ScheduleEvent]] = None
+        
+        # Task diindeks secara dense berdasarkan urutan ID (urutan evaluasi schedule),
+        # sehingga assignment cukup berupa array indeks processor berukuran (N,)
+        self._sorted_tasks = sorted(tasks, key=lambda t: t.id)
+        self._tid_to_idx = {task.id: i for i, task in enumerate(self._sorted_tasks)}
+        self._best_assignment = np.empty(0, dtype=np.int32)
         
-    def _calculate_schedule_makespan(self, assignment: Dict[int, int]) -> Tuple[float, Dict[int, ScheduleEvent]]:
+        # Execution time tiap (task, processor) sebagai array contiguous (N, P),
+        # dihitung sekali dengan fallback rata-rata cost sudah diterapkan, agar
+        # evaluasi neighbor cukup membaca array dan meng-update load processor
+        self._exec = np.array(
+            [self._exec_row(task) for task in self._sorted_tasks], dtype=np.float64
+        ).reshape(len(tasks), len(processors))
+    
+    def _exec_row(self, task: Task) -> List[float]:
         """
-        Menghitung makespan untuk assignment tertentu
+        Execution time satu task di setiap processor (urutan self.processors)
+        
+        Processor tanpa cost (atau cost 0) memakai rata-rata cost task tersebut
+        yang bukan 0 (0.0 jika tidak ada), dihitung sekali per task.
+        """
+        costs = task.computation_cost
+        known = [cost for cost in costs.values() if cost]
+        mean_cost = sum(known) / len(known) if known else 0.0
+        return [costs.get(processor_id, 0.0) or mean_cost for processor_id in self.processors]
+    
+    @property
+    def best_schedule(self) -> Dict[int, ScheduleEvent]:
+        """
+        Schedule terbaik (task_id -> ScheduleEvent), dibangun saat pertama kali
+        diakses; pemanggil search() yang hanya butuh get_makespan() atau
+        get_assignment() tidak membuat ScheduleEvent
+        """
+        if self._best_schedule is None:
+            self._best_schedule = self._build_schedule(self._best_assignment)
+        return self._best_schedule
+    
+    def _makespan_only(self, assignment: np.ndarray) -> float:
+        """
+        Menghitung makespan untuk assignment tertentu tanpa membuat ScheduleEvent
         
         Args:
-            assignment: Dict mapping task_id -> processor_id
+            assignment: Indeks processor tiap task (urutan ID), berukuran (N,)
             
         Returns:
-            Tuple (makespan, schedule_events)
+            Makespan (load processor maksimum)
         """
-        schedule = {}
-        processor_availability = {p: 0.0 for p in self.processors}
-        
-        # Sort tasks by ID to ensure deterministic order for evaluation
-        sorted_tasks = sorted(self.tasks, key=lambda t: t.id)
+        if not len(assignment):
+            return 0.0
+        # Load per processor dijumlahkan dalam urutan task (sama dengan _build_schedule)
+        loads = np.bincount(
+            assignment, weights=self._exec[np.arange(len(assignment)), assignment],
+            minlength=len(self.processors)
+        )
+        return float(loads.max())
+
+    def _build_schedule(self, assignment: np.ndarray) -> Dict[int, ScheduleEvent]:
+        """
+        Membangun schedule lengkap untuk assignment tertentu
         
-        for task in sorted_tasks:
-            processor_id = assignment[task.id]
-            start_time = processor_availability[processor_id]
-            
-            exec_time = task.computation_cost.get(processor_id, 0.0)
-            if exec_time == 0.0 and task.computation_cost:
-                 exec_time = sum(task.computation_cost.values()) / len(task.computation_cost)
+        Args:
+            assignment: Indeks processor tiap task (urutan ID), berukuran (N,)
             
-            finish_time = start_time + exec_time
+        Returns:
+            Dictionary mapping task_id -> ScheduleEvent
+        """
+        schedule = {}
+        processor_availability = np.zeros(len(self.processors))
+        
+        # Tasks dievaluasi berurutan berdasarkan ID
+        for i, pidx in enumerate(assignment.tolist()):
+            task_id = self._sorted_tasks[i].id
+            start_time = float(processor_availability[pidx])
+            finish_time = start_time + float(self._exec[i, pidx])
             
             event = ScheduleEvent(
-                task_id=task.id,
-                processor_id=processor_id,
+                task_id=task_id,
+                processor_id=self.processors[pidx],
                 start_time=start_time,
                 finish_time=finish_time
             )
-            schedule[task.id] = event
-            processor_availability[processor_id] = finish_time
+            schedule[task_id] = event
+            processor_availability[pidx] = finish_time
             
-        makespan = max(processor_availability.values())
-        return makespan, schedule
+        return schedule
+
+    def _initial_temperature(self) -> float:
+        """Temperatur awal kriteria Metropolis"""
+        if self.temperature is not None:
+            return float(self.temperature)
+        return float(self._exec.mean()) * DEFAULT_TEMPERATURE_SCALE if self._exec.size else 0.0
+
+    def search(self) -> float:
+        """
+        Menjalankan pencarian SHC tanpa membangun schedule lengkap
+        
+        Returns:
+            Makespan terbaik yang ditemukan
+        """
+        # 1-2. Initial Solution acak + Hill Climbing Loop (kernel numba)
+        _, self._best_assignment = _run_one(
+            self._exec, self.max_iterations, self.tasks_per_step,
+            self._initial_temperature(), self.patience, self.seed
+        )
+        
+        self.best_makespan = self._makespan_only(self._best_assignment)
+        self._best_schedule = None
+        
+        return self.best_makespan
 
     def schedule_tasks(self) -> Dict[int, ScheduleEvent]:
         """
@@ -69,41 +218,80 @@ class SHCAlgorithm:
         Returns:
             Dictionary mapping task_id -> ScheduleEvent (Best Solution Found)
         """
-        # 1. Initial Solution: Random Assignment
-        current_assignment = {task.id: random.choice(self.processors) for task in self.tasks}
-        current_makespan, current_schedule = self._calculate_schedule_makespan(current_assignment)
+        self.search()
+        # 3. Schedule lengkap (ScheduleEvent) dibangun dari assignment terbaik
+        return self.best_schedule
+
+    def search_parallel(self, n_restarts: Optional[int] = None) -> float:
+        """
+        Menjalankan beberapa climber SHC independen (random restart) secara paralel
+        di proses terpisah dan mengambil solusi dengan makespan terkecil,
+        tanpa membangun schedule lengkap
         
-        self.best_schedule = current_schedule
-        self.best_makespan = current_makespan
+        Args:
+            n_restarts: Jumlah climber (default: jumlah CPU)
         
-        # 2. Hill Climbing Loop
-        for _ in range(self.max_iterations):
-            # Generate Neighbor: Mutasi satu task ke processor lain
-            neighbor_assignment = current_assignment.copy()
-            
-            # Pilih random task dan random processor baru
-            random_task = random.choice(self.tasks)
-            new_processor = random.choice(self.processors)
-            
-            neighbor_assignment[random_task.id] = new_processor
-            
-            # Evaluasi Neighbor
-            neighbor_makespan, neighbor_schedule = self._calculate_schedule_makespan(neighbor_assignment)
-            
-            # Jika lebih baik atau sama, pindah ke neighbor (Stochastic part could be added here, e.g. accept worse with prob)
-            # Untuk simple Hill Climbing, kita hanya terima jika lebih baik atau sama
-            if neighbor_makespan <= current_makespan:
-                current_assignment = neighbor_assignment
-                current_makespan = neighbor_makespan
-                current_schedule = neighbor_schedule
-                
-                # Update global best
-                if current_makespan < self.best_makespan:
-                    self.best_makespan = current_makespan
-                    self.best_schedule = current_schedule
+        Returns:
+            Makespan terbaik yang ditemukan
+        """
+        n_restarts = max(1, n_restarts or os.cpu_count() or 1)
+        # Seed tiap climber diturunkan dari self.seed agar hasil tetap reproducible
+        seeds = np.random.SeedSequence(self.seed).spawn(n_restarts)
+        temperature = self._initial_temperature()
+        
+        with ProcessPoolExecutor(max_workers=min(n_restarts, os.cpu_count() or 1)) as executor:
+            futures = [
+                executor.submit(_run_one, self._exec, self.max_iterations,
+                                self.tasks_per_step, temperature, self.patience, seed)
+                for seed in seeds
+            ]
+            results = [future.result() for future in futures]
+        
+        _, self._best_assignment = min(results, key=lambda result: result[0])
+        self.best_makespan = self._makespan_only(self._best_assignment)
+        self._best_schedule = None
+        
+        return self.best_makespan
+
+    def schedule_tasks_parallel(self, n_restarts: Optional[int] = None) -> Dict[int, ScheduleEvent]:
+        """
+        Versi paralel schedule_tasks() (lihat search_parallel)
+        
+        Args:
+            n_restarts: Jumlah climber (default: jumlah CPU)
         
+        Returns:
+            Dictionary mapping task_id -> ScheduleEvent (Best Solution Found)
+        """
+        self.search_parallel(n_restarts)
+        # Schedule lengkap hanya dibangun untuk climber terbaik
         return self.best_schedule
 
+    def get_assignment(self) -> Dict[int, str]:
+        """
+        Assignment terbaik (task_id -> processor_id) langsung dari _best_assignment,
+        tanpa membuat ScheduleEvent
+        """
+        processors = self.processors
+        return {
+            task.id: processors[pidx]
+            for task, pidx in zip(self._sorted_tasks, self._best_assignment.tolist())
+        }
+
     def get_makespan(self) -> float:
         """Menghitung makespan terbaik yang ditemukan"""
         return self.best_makespan
+
+
+# Warm-up: kompilasi (atau muat dari cache) kernel JIT saat import dengan input
+# dummy bertipe sama seperti pemanggilan sebenarnya, agar schedule_tasks()
+# pertama tidak menanggung waktu kompilasi
+if NUMBA_AVAILABLE and not SHC_KERNEL_AOT:
+    try:
+        _shc_inner(
+            np.zeros((1, 1)), np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.int32),
+            np.zeros(1), 1, 1, 0.0, 0
+        )
+    except Exception:
+        # Tidak fatal: kernel akan dikompilasi saat pemanggilan pertama
+        pass
@@ -0,0 +1,183 @@
+"""
+Kernel inner loop Stochastic Hill Climbing (SHC)
+
+Fungsi shc_inner ditulis sebagai Python biasa agar bisa dipakai dengan dua cara:
+- dikompilasi ahead-of-time (AOT) menjadi modul ekstensi shc_kernel_aot dengan
+  menjalankan `python shc_kernel.py` (butuh numba dan compiler C), sehingga
+  tidak ada waktu kompilasi JIT saat runtime;
+- jika modul AOT tidak tersedia, shc_algorithm membungkusnya dengan
+  @njit(cache=True) (atau menjalankannya sebagai Python biasa tanpa numba).
+"""
+
+import math
+import numpy as np
+
+# Signature ekspor AOT; tipe argumen harus sama persis dengan pemanggil di shc_algorithm
+AOT_MODULE_NAME = 'shc_kernel_aot'
+AOT_SIGNATURE = 'Tuple((i4[:], f8))(f8[:, :], i4[:], i4[:], f8[:], i8, i8, f8, i8)'
+
+
+def shc_inner(exec_mat, init_assignment, task_choices, accept_u, max_iter,
+              tasks_per_step, initial_temperature, patience):
+    """
+    Loop hill climbing dengan load processor yang di-update secara incremental
+    
+    Setiap iterasi memilih tasks_per_step task acak dan mengevaluasi semua
+    pemindahan task tersebut ke processor lain (P - 1 neighbor per task), lalu
+    menerima neighbor terbaik jika makespan-nya tidak lebih buruk. Neighbor yang
+    lebih buruk sebesar delta diterima dengan probabilitas exp(-delta / T)
+    (kriteria Metropolis), dengan T = initial_temperature * (1 - i / max_iter)
+    yang turun linear ke 0.
+    Pilihan acak sudah di-draw sebelumnya: task ke-k pada iterasi ke-i
+    memakai elemen i * tasks_per_step + k. Loop berhenti lebih awal jika
+    solusi terbaik tidak membaik selama patience iterasi berturut-turut.
+    
+    Makespan neighbor dihitung dalam O(1): pemindahan hanya mengubah load
+    processor lama dan baru, sedangkan load maksimum processor lainnya pasti
+    salah satu dari tiga load terbesar (top1..top3), yang dihitung ulang
+    dalam O(P) hanya saat sebuah neighbor diterima.
+    
+    Pada hill climbing murni (initial_temperature == 0), task yang sudah
+    dievaluasi sejak neighbor terakhir diterima (tabu) dilewati, karena solusi
+    saat ini belum berubah sehingga keputusannya pasti sama. Dengan Metropolis
+    keputusan bergantung pada sampel acak, sehingga tabu tidak dipakai.
+    
+    Args:
+        exec_mat: Execution time berukuran (N, P)
+        init_assignment: Indeks processor awal tiap task, berukuran (N,)
+        task_choices: Indeks task yang dipindahkan, berukuran (max_iter * tasks_per_step,)
+        accept_u: Sampel uniform [0, 1) untuk kriteria Metropolis, berukuran (max_iter,)
+        max_iter: Jumlah iterasi
+        tasks_per_step: Jumlah task acak yang dievaluasi per iterasi
+        initial_temperature: Temperatur awal (0 = hanya terima jika tidak lebih buruk)
+        patience: Jumlah iterasi tanpa perbaikan sebelum berhenti (<= 0 = tanpa batas)
+        
+    Returns:
+        Tuple (best_assignment, best_makespan)
+    """
+    num_tasks, num_procs = exec_mat.shape
+    
+    current = init_assignment.copy()
+    loads = np.zeros(num_procs)
+    for i in range(num_tasks):
+        loads[current[i]] += exec_mat[i, current[i]]
+    current_mk = 0.0
+    for p in range(num_procs):
+        if loads[p] > current_mk:
+            current_mk = loads[p]
+    
+    best = current.copy()
+    best_mk = current_mk
+    # Tanpa task atau hanya satu processor: tidak ada neighbor
+    if num_tasks == 0 or num_procs < 2:
+        return best, best_mk
+    
+    # Indeks tiga processor dengan load terbesar (-1 jika P < 3)
+    top1 = -1
+    top2 = -1
+    top3 = -1
+    for p in range(num_procs):
+        if top1 < 0 or loads[p] > loads[top1]:
+            top3 = top2
+            top2 = top1
+            top1 = p
+        elif top2 < 0 or loads[p] > loads[top2]:
+            top3 = top2
+            top2 = p
+        elif top3 < 0 or loads[p] > loads[top3]:
+            top3 = p
+    
+    # tried_at[t] == accepted: task t sudah dievaluasi untuk solusi saat ini.
+    # Menaikkan counter accepted setara dengan mengosongkan tabu list dalam O(1)
+    use_tabu = initial_temperature <= 0.0
+    tried_at = np.full(num_tasks, -1, dtype=np.int64)
+    accepted = 0
+    
+    stagnant = 0
+    for it in range(max_iter):
+        if patience > 0 and stagnant >= patience:
+            break
+        stagnant += 1
+        
+        move_mk = np.inf
+        move_task = -1
+        move_proc = -1
+        for k in range(it * tasks_per_step, (it + 1) * tasks_per_step):
+            t = task_choices[k]
+            if use_tabu:
+                if tried_at[t] == accepted:
+                    continue
+                tried_at[t] = accepted
+            old_p = current[t]
+            for new_p in range(num_procs):
+                if new_p == old_p:
+                    continue
+                # Makespan neighbor: load maksimum processor selain old_p/new_p
+                # (dari top1..top3), dibandingkan dengan load baru old_p dan new_p
+                if top1 != old_p and top1 != new_p:
+                    mk = loads[top1]
+                elif top2 >= 0 and top2 != old_p and top2 != new_p:
+                    mk = loads[top2]
+                elif top3 >= 0 and top3 != old_p and top3 != new_p:
+                    mk = loads[top3]
+                else:
+                    mk = 0.0
+                load = loads[old_p] - exec_mat[t, old_p]
+                if load > mk:
+                    mk = load
+                load = loads[new_p] + exec_mat[t, new_p]
+                if load > mk:
+                    mk = load
+                if mk < move_mk:
+                    move_mk = mk
+                    move_task = t
+                    move_proc = new_p
+        
+        # Semua task pilihan iterasi ini sudah pernah dievaluasi
+        if move_task < 0:
+            continue
+        
+        accept = move_mk <= current_mk
+        if not accept and initial_temperature > 0.0:
+            temperature = initial_temperature * (1.0 - it / max_iter)
+            accept = temperature > 0.0 and accept_u[it] < math.exp(-(move_mk - current_mk) / temperature)
+        if accept:
+            old_p = current[move_task]
+            loads[old_p] -= exec_mat[move_task, old_p]
+            loads[move_proc] += exec_mat[move_task, move_proc]
+            current[move_task] = move_proc
+            current_mk = move_mk
+            accepted += 1
+            
+            top1 = -1
+            top2 = -1
+            top3 = -1
+            for p in range(num_procs):
+                if top1 < 0 or loads[p] > loads[top1]:
+                    top3 = top2
+                    top2 = top1
+                    top1 = p
+                elif top2 < 0 or loads[p] > loads[top2]:
+                    top3 = top2
+                    top2 = p
+                elif top3 < 0 or loads[p] > loads[top3]:
+                    top3 = p
+            
+            # Update global best
+            if current_mk < best_mk:
+                best_mk = current_mk
+                best[:] = current
+                stagnant = 0
+    
+    return best, best_mk
+
+
+if __name__ == '__main__':
+    import os
+    from numba.pycc import CC
+    
+    cc = CC(AOT_MODULE_NAME)
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('shc_inner', AOT_SIGNATURE)(shc_inner)
+    cc.compile()
+    print(f"Modul {AOT_MODULE_NAME} berhasil dikompilasi ke {cc.output_dir}")